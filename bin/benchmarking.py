@@ -1,21 +1,33 @@
 import logging
 import math
 import io
+import hashlib
+import csv
 import subprocess
 import time
 import os
+import sys
+import shlex
+import signal
+import tempfile
+import re
+import json
+import select
 import threading
+import contextlib
 from pathlib import Path
 import argparse
-from collections import defaultdict
-import matplotlib.pyplot as plt
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 import enum
 from itertools import cycle
 
 import pddl
 from hipop.grounding.problem import Problem
+from hipop.grounding.atoms import Atoms
 from hipop.utils.logger import setup_logging
+from hipop.utils.cli import add_bool_arg, EnumAction
+from hipop.utils import cache
 
 LOGGER = logging.getLogger('benchmarking')
 
@@ -37,175 +49,548 @@ BENCHMARKS = {
     'p-zenotravel': os.path.join('partial-order', 'Zenotravel'),
 }
 
+# planners run with the interpreter of the benchmarks
+PLANNER = [sys.executable, '-m', 'hipop']
+PLANNER_WORKER = [sys.executable, '-m', 'hipop.worker']
+# fixed hash seed: set and dict iteration orders, hence searches, are reproducible
+PLANNER_ENV = dict(os.environ, PYTHONHASHSEED='0')
+
+class Runner(enum.Enum):
+    """How the hipop planner is run."""
+    PROCESS = 'process'  # a new process per run
+    WORKER = 'worker'  # a persistent planner per benchmark process
+    INLINE = 'inline'  # in the benchmark process itself
+
+# persistent planner of the current process, see planner_worker()
+WORKER = None
+# verifications done by the current process, see verify()
+VERIFICATIONS = {}
+
+PDDL_FILE = re.compile(r'.*\..ddl\Z', re.DOTALL)
+
+CSV_FIELDS = ['problem_file', 'alg', 'domain', 'problem',
+              'domain_parsing_time', 'parsing_time', 'problem_time',
+              'solving_time', 'verif']
+
 class Statistics:
+    # plain record created for every run: no per-instance __dict__
+    __slots__ = ('domain', 'problem', 'alg', 'domain_parsing_time',
+                 'parsing_time', 'problem_time', 'solving_time', 'verif')
+
     def __init__(self, domain, problem, alg):
         self.domain = domain
         self.problem = problem
         self.alg = alg
+        self.domain_parsing_time = math.inf
         self.parsing_time = math.inf
         self.problem_time = math.inf
         self.solving_time = math.inf
         self.verif = False
+    def copy(self):
+        stats = Statistics.__new__(Statistics)
+        stats.domain = self.domain
+        stats.problem = self.problem
+        stats.alg = self.alg
+        stats.domain_parsing_time = self.domain_parsing_time
+        stats.parsing_time = self.parsing_time
+        stats.problem_time = self.problem_time
+        stats.solving_time = self.solving_time
+        stats.verif = self.verif
+        return stats
+    __copy__ = copy
     def __str__(self):
-        return f"{self.domain} {self.problem} {self.alg} {self.parsing_time} {self.problem_time} {self.solving_time} {self.verif}"
+        return f"{self.domain} {self.problem} {self.alg} {self.domain_parsing_time} {self.parsing_time} {self.problem_time} {self.solving_time} {self.verif}"
 
 def setup():
     setup_logging(level=logging.WARNING, without=['hipop.'])
 
-def solve(domain, problem, options, count, timeout, stats):
+def terminate(process, grace=5):
+    """Stop the process group of a process, killing it if SIGTERM is not enough."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            LOGGER.warning("- process group %d still running: killing it", process.pid)
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+    except ProcessLookupError:
+        # already gone
+        process.wait()
+
+def planner_worker():
+    """Persistent planner of the current process, started when needed."""
+    global WORKER
+    if WORKER is None or WORKER.poll() is not None:
+        LOGGER.info("Starting planner worker")
+        WORKER = subprocess.Popen(PLANNER_WORKER,
+                                  stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE,
+                                  encoding='utf-8',
+                                  env=PLANNER_ENV,
+                                  start_new_session=True)
+    return WORKER
+
+def solve_in_worker(arguments, timeout):
+    """Solve a problem in the persistent planner; returns the plan or None."""
+    global WORKER
+    worker = planner_worker()
+    worker.stdin.write(json.dumps(arguments) + '\n')
+    worker.stdin.flush()
+    ready, _, _ = select.select([worker.stdout], [], [], timeout)
+    if not ready:
+        # the worker is busy with the timed out problem: replace it
+        LOGGER.info("- timeout: stopping planner worker %d", worker.pid)
+        terminate(worker)
+        WORKER = None
+        raise subprocess.TimeoutExpired(PLANNER_WORKER, timeout)
+    answer = worker.stdout.readline()
+    if not answer:
+        LOGGER.warning("Planner worker %d died", worker.pid)
+        worker.wait()
+        WORKER = None
+        return None
+    return json.loads(answer)['plan']
+
+def solve_inline(arguments, timeout):
+    """Solve a problem in the current process; returns the plan or None."""
+    from hipop.__main__ import build_parser, solve as solve_hipop
+    args = build_parser().parse_args(arguments)
+    def expire(signum, frame):
+        raise subprocess.TimeoutExpired(PLANNER, timeout)
+    # atoms of the previous problem must not leak into this one
+    Atoms.clear()
+    handler = signal.signal(signal.SIGALRM, expire)
+    signal.alarm(timeout or 0)
+    try:
+        # the planner may print: keep the benchmark output clean
+        with contextlib.redirect_stdout(sys.stderr):
+            return solve_hipop(args)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, handler)
+
+def solve(domain, problem, options, count, timeout, stats, plan_file,
+          runner=Runner.PROCESS):
     LOGGER.info("Solving problem %s with %s", problem, options)
-    tic = time.time()
-    result = subprocess.run(options + [domain, problem],
-                            timeout=timeout,
-                            stdout=subprocess.PIPE, 
-                            encoding='utf-8')
-    toc = time.time()
-    LOGGER.info("- duration: %.3f", (toc - tic))
-    stats.solving_time = (toc-tic)
-    f = open('plan.plan', 'w')
-    f.write(result.stdout)
-    f.close()
-    LOGGER.info("- result: %s", result)
-    return result.returncode == 0
-
-def verify(domain, problem, plan, prefix):
-    verificator = subprocess.Popen([os.path.join(prefix, "pandaPIparser"),
-                                    "-verify",
-                                    domain,
-                                    problem,
-                                    plan], stdout=subprocess.PIPE)
-    verification = verificator.stdout.read().decode(encoding='utf-8')
-    return verification.count("true")
-
-def build_problem(domain, problem):
-    tic = time.process_time()
+    if runner != Runner.PROCESS and options[:len(PLANNER)] == PLANNER:
+        arguments = options[len(PLANNER):] + [domain, problem]
+        tic = time.perf_counter_ns()
+        if runner == Runner.WORKER:
+            plan = solve_in_worker(arguments, timeout)
+        else:
+            plan = solve_inline(arguments, timeout)
+        toc = time.perf_counter_ns()
+        returncode = 0 if plan is not None else 1
+        if plan:
+            Path(plan_file).write_text(plan, encoding='utf-8')
+    else:
+        tic = time.perf_counter_ns()
+        # the plan goes straight from the planner to the plan file;
+        # the planner gets its own process group so that, at the deadline,
+        # it is killed together with any process it spawned
+        with open(plan_file, 'wb') as output, \
+             subprocess.Popen(options + [domain, problem],
+                              stdout=output,
+                              env=PLANNER_ENV,
+                              start_new_session=True) as result:
+            try:
+                result.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                LOGGER.info("- timeout: stopping process group %d", result.pid)
+                terminate(result)
+                raise
+        toc = time.perf_counter_ns()
+        returncode = result.returncode
+        plan = os.path.getsize(plan_file) > 0
+    stats.solving_time = (toc - tic) * 1e-9
+    LOGGER.info("- duration: %.3f", stats.solving_time)
+    LOGGER.info("- result: %s", returncode)
+    # no plan found: nothing to verify
+    return returncode == 0 and bool(plan)
+
+def verification_key(verifier, domain, problem, plan):
+    """Key of a verification: planners often find the very same plans."""
+    with open(plan, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=32).hexdigest()
+    return ('verification', cache.files_key(verifier, domain, problem), digest)
+
+def panda_verifier(prefix):
+    return os.path.join(prefix, "pandaPIparser")
+
+def verify(domain, problem, plan, prefix, timeout=None, cache_dir=None):
+    verifier = panda_verifier(prefix)
+    key = verification_key(verifier, domain, problem, plan)
+    if key in VERIFICATIONS:
+        return VERIFICATIONS[key]
+    if cache_dir:
+        verification_file = cache.cache_file(cache_dir, *key)
+        verif = cache.load(verification_file)
+        if verif is not None:
+            VERIFICATIONS[key] = verif
+            return verif
+    with subprocess.Popen([verifier,
+                           "-verify",
+                           domain,
+                           problem,
+                           plan],
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL) as verificator:
+        timer = threading.Timer(timeout, verificator.kill)
+        if timeout is not None:
+            timer.start()
+        try:
+            # the verifier output may be large: count while it is read,
+            # on raw bytes since it is ASCII
+            verif = sum(line.count(b"true") for line in verificator.stdout)
+        finally:
+            timer.cancel()
+    if timeout is not None and verificator.returncode == -signal.SIGKILL:
+        raise subprocess.TimeoutExpired(verificator.args, timeout)
+    VERIFICATIONS[key] = verif
+    if cache_dir:
+        cache.dump(verif, verification_file)
+    return verif
+
+@lru_cache(maxsize=8)
+def cached_domain(domain, mtime, size):
+    """Parse a PDDL domain; each worker parses a given domain only once."""
+    # parsing is pure Python: measure CPU time
+    tic = time.process_time_ns()
     LOGGER.info("Parsing PDDL domain %s", domain)
-    pddl_domain = pddl.parse_domain(domain, file_stream=True)
+    pddl_domain = pddl.parse_domain(Path(domain).read_text(encoding='utf-8'))
+    toc = time.process_time_ns()
+    LOGGER.info("domain parsing duration: %.3f", (toc - tic) * 1e-9)
+    return pddl_domain, (toc - tic) * 1e-9
+
+def parse_domain(domain):
+    """Parsed domain and its parsing time; a modified domain is parsed again."""
+    domain = os.path.realpath(domain)
+    return cached_domain(domain, os.path.getmtime(domain), os.path.getsize(domain))
+
+def build_problem(pddl_domain, problem):
+    tic = time.process_time_ns()
     LOGGER.info("Parsing PDDL problem %s", problem)
-    pddl_problem = pddl.parse_problem(problem, file_stream=True)
-    toc = time.process_time()
-    LOGGER.info("parsing duration: %.3f", (toc - tic))
+    pddl_problem = pddl.parse_problem(Path(problem).read_text(encoding='utf-8'))
+    toc = time.process_time_ns()
     stats = Statistics(pddl_domain.name, pddl_problem.name, '')
-    stats.parsing_time = (toc - tic)
-    #tic = time.process_time()
+    stats.parsing_time = (toc - tic) * 1e-9
+    LOGGER.info("parsing duration: %.3f", stats.parsing_time)
+    #tic = time.process_time_ns()
     #LOGGER.info("Building problem")
     #shop_problem = Problem(pddl_problem, pddl_domain)
-    #toc = time.process_time()
-    #stats.problem_time = (toc - tic)
+    #toc = time.process_time_ns()
+    #stats.problem_time = (toc - tic) * 1e-9
     #LOGGER.info("building problem duration: %.3f", (toc - tic))
     return pddl_problem, stats
 
-def process_problem(pddl_domain, pddl_problem,
-                    options, c, timeout, stats, panda_prefix):
-    results = deepcopy(stats)
+def result_cache_file(cache_dir, domain, problem, verifier, options, timeout, repeat=1,
+                      runner=Runner.PROCESS):
+    """Cache file of a run, invalidated when the planner, the problem or the verifier change.
+
+    Timings of a runner are not comparable with the others: it is part of the key.
+    """
+    return cache.cache_file(cache_dir, 'result', cache.contents_key(domain, problem),
+                            options, timeout, repeat, runner.value,
+                            cache.files_key(verifier),
+                            cache.planner_version())
+
+def process_problem(pddl_domain, pddl_problem, alg,
+                    options, c, timeout, stats, panda_prefix,
+                    cache_dir=None, keep_plans=False, runner=Runner.PROCESS,
+                    repeat=1):
+    if cache_dir:
+        cache_file = result_cache_file(cache_dir, pddl_domain, pddl_problem,
+                                       panda_verifier(panda_prefix),
+                                       options, timeout, repeat, runner)
+        results = cache.load(cache_file)
+        if results is not None:
+            LOGGER.info("Reusing results of %s with %s", pddl_problem, options)
+            return results
+    results = stats.copy()
+    results.alg = alg
+    # unique plan file, so that concurrent runs never share a plan;
+    # plans which are not kept only live in the temporary directory
+    fd, plan_file = tempfile.mkstemp(prefix=f"plan-{alg}-", suffix=".plan",
+                                     dir='.' if keep_plans else None)
+    os.close(fd)
     try:
-        if solve(pddl_domain, pddl_problem, options, c, timeout, results):
-            results.verif = verify(pddl_domain, pddl_problem, 'plan.plan', panda_prefix)
+        solving_time = math.inf
+        for _ in range(max(1, repeat)):
+            if not solve(pddl_domain, pddl_problem, options, c, timeout,
+                         results, plan_file, runner):
+                break
+            # the minimum is the least noisy estimate of the solving time
+            solving_time = min(solving_time, results.solving_time)
+        else:
+            results.solving_time = solving_time
+            results.verif = verify(pddl_domain, pddl_problem, plan_file,
+                                   panda_prefix, timeout, cache_dir)
     except subprocess.TimeoutExpired:
-        pass
-    print(results)
+        # interrupted runs, by the planner or the verifier timeout, are not cached
+        return results
+    finally:
+        if not keep_plans:
+            os.remove(plan_file)
+    if cache_dir:
+        cache.dump(results, cache_file)
     return results
 
+def prepare_problem(domain, problem):
+    pddl_domain, domain_parsing_time = parse_domain(domain)
+    _, stats = build_problem(pddl_domain, problem)
+    stats.domain_parsing_time = domain_parsing_time
+    return stats
+
+def scan_pddl(directory):
+    """PDDL files below a directory; scandir entries spare a stat per file."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from scan_pddl(entry.path)
+            elif PDDL_FILE.match(entry.name):
+                yield Path(entry.path)
+
+@lru_cache(maxsize=32)
+def glob_pddl(directory, mtime):
+    """Sorted PDDL files of a directory; mtime invalidates cached listings."""
+    return tuple(sorted(scan_pddl(directory)))
+
+def pddl_files(directory):
+    return glob_pddl(directory, os.path.getmtime(directory))
+
 def process_domain(benchmark, bench_root,
-                   max_bench, options, c, timeout, panda_prefix):
+                   max_bench, options, c, timeout, panda_prefix,
+                   jobs=None, cache_dir=None, keep_plans=False,
+                   problem_cache=False, csv_file='results.csv',
+                   runner=Runner.PROCESS, repeat=1, keep_results=True):
     root = os.path.join(bench_root, benchmark)
-    domain = next(Path(os.path.join(root, 'domains')).rglob('*.?ddl'))
-    bench = 1
-    results = defaultdict(list)
-    problems = []
-
-    hipop = ['python3', '-m', 'hipop']
-
-    for problem in sorted(Path(os.path.join(root, 'problems')).rglob('*.?ddl')):
-        problems.append(problem)
-        pb, stats = build_problem(domain, problem)
-        print(f" -- problem {pb.name}")
-        algs = []
-        # Plan-Depth -- OL in lifo / sorted / local / earliest
-        for ol in ['lifo', 'sorted', 'local', 'earliest']:
-            algs.append([f'hipop-depth-{ol}'] + hipop +
-                           ['--ol', ol,
-                           '--plan', 'depth'])
-        # Bechon -- OL in lifo / sorted / local / earliest -- Hadd in bare / reuse / advanced-resuse
-        #for ol in ['lifo', 'sorted', 'local', 'earliest']:
-        #    for hadd in ['hadd', 'hadd-reuse', 'hadd-areuse']:
-        #        algs.append([f'hipop-bechon-{ol}-{hadd}',
-        #                   'hipop-pop.py', 
-        #                   '--ol', ol, 
-        #                   '--hadd', hadd,
-        #                   '--plan', 'bechon'])
-        # Hadd-Max -- OL in lifo / sorted / local / earliest -- Hadd in bare / reuse / advanced-resuse
-        #for ol in ['lifo', 'sorted', 'local', 'earliest']:
-        #    for hadd in ['hadd', 'hadd-reuse', 'hadd-areuse']:
-        #        algs.append([f'hipop-haddmax-{ol}-{hadd}',
-        #                   'hipop-pop.py', 
-        #                   '--ol', ol, 
-        #                   '--hadd', hadd,
-        #                   '--plan', 'hadd-max'])
-        for o in algs:
-            print(f" -- alg {o[1:]}")
-            results[o[0]].append(process_problem(domain, problem,
-                                       o[1:], c, timeout,
-                                       stats, panda_prefix))
-        bench += 1
-        if bench > max_bench:
-            break
-    return problems, results
+    domain = pddl_files(os.path.join(root, 'domains'))[0]
+    problems = pddl_files(os.path.join(root, 'problems'))
+    if max_bench < len(problems):
+        problems = problems[:max_bench]
+
+    # options are common to all configurations
+    hipop = list(PLANNER) + options
+    if problem_cache:
+        # configurations only differ by search options: share the grounding
+        hipop.append('--cache')
+
+    algs = []
+    # Plan-Depth -- OL in lifo / sorted / local / earliest
+    for ol in ['lifo', 'sorted', 'local', 'earliest']:
+        algs.append([f'hipop-depth-{ol}'] + hipop +
+                       ['--ol', ol,
+                       '--plan', 'depth'])
+    # Bechon -- OL in lifo / sorted / local / earliest -- Hadd in bare / reuse / advanced-resuse
+    #for ol in ['lifo', 'sorted', 'local', 'earliest']:
+    #    for hadd in ['hadd', 'hadd-reuse', 'hadd-areuse']:
+    #        algs.append([f'hipop-bechon-{ol}-{hadd}',
+    #                   'hipop-pop.py', 
+    #                   '--ol', ol, 
+    #                   '--hadd', hadd,
+    #                   '--plan', 'bechon'])
+    # Hadd-Max -- OL in lifo / sorted / local / earliest -- Hadd in bare / reuse / advanced-resuse
+    #for ol in ['lifo', 'sorted', 'local', 'earliest']:
+    #    for hadd in ['hadd', 'hadd-reuse', 'hadd-areuse']:
+    #        algs.append([f'hipop-haddmax-{ol}-{hadd}',
+    #                   'hipop-pop.py', 
+    #                   '--ol', ol, 
+    #                   '--hadd', hadd,
+    #                   '--plan', 'hadd-max'])
+
+    # Runs are independent: each (problem, algorithm) pair is solved
+    # in its own worker as soon as the problem has been parsed.
+    # Problems are parsed in sequence by a dedicated worker, so that parsing
+    # a problem overlaps with solving the previous one. Larger problems
+    # come last in benchmarks: they are dispatched first to avoid stragglers.
+    # Each result is also appended to a CSV file as soon as it is known,
+    # so that an interrupted benchmark keeps its completed runs.
+    # results are only kept for plots: scores are summed as runs complete
+    results = {o[0]: [None] * len(problems) for o in algs} if keep_results else None
+    scores = {o[0]: (0, 0) for o in algs}
+    if jobs is None:
+        jobs = max(1, os.cpu_count() - 1)
+    jobs = min(jobs, max(1, len(problems) * len(algs)))
+    with ProcessPoolExecutor(max_workers=1) as prefetcher, \
+         ProcessPoolExecutor(max_workers=jobs) as executor, \
+         open(csv_file, 'w', newline='') as sink:
+        writer = csv.writer(sink)
+        writer.writerow(CSV_FIELDS)
+        parsings = [(index, prefetcher.submit(prepare_problem, str(domain),
+                                              str(problems[index])))
+                    for index in reversed(range(len(problems)))]
+        runs = {}
+        for index, future in parsings:
+            stats = future.result()
+            print(f" -- problem {stats.problem}")
+            for o in algs:
+                runs[executor.submit(process_problem, str(domain),
+                                     str(problems[index]), o[0], o[1:], c,
+                                     timeout, stats, panda_prefix,
+                                     cache_dir, keep_plans,
+                                     runner, repeat)] = (o[0], index)
+        for future in as_completed(runs):
+            alg, index = runs[future]
+            stats = future.result()
+            if keep_results:
+                results[alg][index] = stats
+            add_score(scores, stats, timeout)
+            print(stats)
+            writer.writerow([problems[index], alg, stats.domain, stats.problem,
+                             stats.domain_parsing_time,
+                             stats.parsing_time, stats.problem_time,
+                             stats.solving_time, stats.verif])
+            sink.flush()
+    return problems, results, scores
+
+def add_score(scores, stats, timeout):
+    """Add a run to the IPC score and the number of unsolved problems of its algorithm.
+
+    The IPC score is only defined with a timeout: without one, only
+    unsolved problems are counted.
+    """
+    score, unsolved = scores.get(stats.alg, (0, 0))
+    if math.isinf(stats.solving_time) or (stats.verif < 8):
+        unsolved += 1
+    elif timeout is not None:
+        score += min(1, 1 - math.log(stats.solving_time)/math.log(timeout))
+    scores[stats.alg] = (score, unsolved)
+
+def load_results(csv_file):
+    """Read back the results of a benchmark from its CSV file."""
+    with open(csv_file, newline='') as source:
+        rows = list(csv.DictReader(source))
+    problems = sorted(set(row['problem_file'] for row in rows))
+    index = {problem: i for i, problem in enumerate(problems)}
+    results = {}
+    for row in rows:
+        stats = Statistics(row['domain'], row['problem'], row['alg'])
+        stats.domain_parsing_time = float(row.get('domain_parsing_time', math.inf))
+        stats.parsing_time = float(row['parsing_time'])
+        stats.problem_time = float(row['problem_time'])
+        stats.solving_time = float(row['solving_time'])
+        stats.verif = 0 if row['verif'] == 'False' else int(row['verif'])
+        # runs missing from an interrupted benchmark are unsolved
+        if stats.alg not in results:
+            results[stats.alg] = [Statistics(stats.domain, '', stats.alg)
+                                  for _ in problems]
+        results[stats.alg][index[row['problem_file']]] = stats
+    return [Path(problem) for problem in problems], results
+
+def plot_results(benchmark, problems, results, savefig=None, show=False):
+    # matplotlib is only loaded when plotting; pyplot only to show the figure
+    if show:
+        import matplotlib.pyplot as plt
+        fig = plt.figure()
+    else:
+        from matplotlib.figure import Figure
+        fig = Figure()
+    import numpy as np
+    ax = fig.subplots()
+    color_codes = map('C{}'.format, cycle(range(10)))
+    marker = cycle(('+', '.', 'o', '*', 's', 'x'))
+    # one series per algorithm; unverified plans are not drawn
+    algs = list(results)
+    times = np.array([[x.solving_time for x in results[alg]] for alg in algs],
+                     dtype=float)
+    verifs = np.array([[x.verif for x in results[alg]] for alg in algs])
+    times = np.where(np.isin(verifs, [3, 8]), times, np.nan)
+    lines = ax.plot(np.arange(len(problems)), times.T, fillstyle='none')
+    for line, alg, color, m in zip(lines, algs, color_codes, marker):
+        line.set(color=color, marker=m, label=alg)
+    ax.set_xticks(range(len(problems)))
+    ax.set_xticklabels([f"{x+1}" for x in range(len(problems))])
+    ax.set_xlabel("problem")
+    ax.set_ylabel("solving time (s)")
+    ax.set_title(benchmark)
+    ax.legend(loc='center left', bbox_to_anchor=(1.04, 0.5))
+    if savefig:
+        fig.savefig(f"{savefig}", bbox_inches="tight")
+    if show:
+        plt.show()
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="HiPOP benchmarking", formatter_class=argparse.RawTextHelpFormatter)
-    parser.add_argument("benchmark", help="Benchmark name", type=str,
-                        choices=BENCHMARKS.keys())
+    parser.add_argument("benchmark", help="Benchmark names", type=str,
+                        choices=BENCHMARKS.keys(), nargs='+')
     parser.add_argument("-N", "--nb-problems", default=math.inf,
                         help="Number of problems to solve", type=int)
     parser.add_argument("-p", "--ipc2020-prefix", dest='prefix',
                         help="Prefix path to IPC2020 benchmarks",
                         default=os.path.join('..', 'ipc2020-domains'))
     parser.add_argument("-P", "--plot", help="Plot results", action="store_true")
-    parser.add_argument("--savefig", help="Save plot results in figure",
+    parser.add_argument("--savefig", help="Save plot results in figure;\n"
+                        "'{benchmark}' is replaced by the benchmark name",
                         type=str)
     parser.add_argument("--panda-prefix",
                         help="Prefix path to PANDA verifier",
                         default=os.path.join('..', 'pandaPIparser'))
     parser.add_argument("-T", "--timeout", default=None,
                         help="Timeout in seconds", type=int)
+    parser.add_argument("-j", "--jobs", default=None,
+                        help="Number of runs solved in parallel (default: number of CPUs minus one)",
+                        type=int)
+    add_bool_arg(parser, 'cache', 'cache',
+                 "reuse results of previous runs on unchanged problems", False)
+    parser.add_argument("--cache-dir", default='.bench_cache',
+                        help="Directory of cached results")
+    parser.add_argument("--keep-plans", action="store_true",
+                        help="Keep plan files once verified")
+    parser.add_argument("--csv", help="CSV file of results (default: bench-{benchmark}.csv)",
+                        type=str)
+    parser.add_argument("--from-csv", action="store_true",
+                        help="Do not run the benchmark: read its results from the CSV file")
+    add_bool_arg(parser, 'problem-cache', 'problem_cache',
+                 "let the planner reuse grounded problems of previous runs", False)
+    parser.add_argument("--runner", help="How hipop is run: a process per run, a persistent worker\n"
+                        "per benchmark process, or inline in the benchmark processes",
+                        type=Runner, default=Runner.PROCESS, action=EnumAction)
+    parser.add_argument("-O", "--planner-options", default='', type=str,
+                        help="Options given to the planner in all configurations, e.g. '--no-mutex'")
+    parser.add_argument("--repeat", default=1, type=int,
+                        help="Number of times each run is solved; the minimum solving time is kept")
 
     args = parser.parse_args()
+    if len(args.benchmark) > 1:
+        # each benchmark would overwrite the files of the previous ones
+        for option, value in (('--csv', args.csv), ('--savefig', args.savefig)):
+            if value and '{benchmark}' not in value:
+                parser.error(f"{option} must contain '{{benchmark}}' with several benchmarks")
     setup()
     if args.prefix:
         bench_root = args.prefix
     else:
         bench_root = os.path.join('..', 'ipc2020-domains')
-    problems, results = process_domain(BENCHMARKS[args.benchmark],
-                                       bench_root,
-                                       args.nb_problems, 
-                                       [],
-                                       0,
-                                       args.timeout,
-                                       args.panda_prefix)
-    if args.plot or args.savefig:
-        color_codes = map('C{}'.format, cycle(range(10)))
-        marker = cycle(('+', '.', 'o', '*', 's', 'x'))
-        for alg, res in results.items():
-            plt.plot(range(len(problems)), [(x.solving_time if x.verif in [3, 8] else None) for x in res],
-                    color=next(color_codes), marker=next(marker), label=alg, fillstyle='none')
-        plt.xticks([x for x in range(len(problems))], [f"{x+1}" for x in range(len(problems))])
-        plt.xlabel("problem")
-        plt.ylabel("solving time (s)")
-        plt.title(args.benchmark)
-        plt.legend(loc='center left', bbox_to_anchor=(1.04, 0.5))
-        if args.savefig:
-            plt.savefig(f"{args.savefig}", bbox_inches="tight")
-        if args.plot:
-            plt.show()
-
-
-    for alg, res in results.items():
-        score = 0
-        unsolved = 0
-        for bench in res:
-            if math.isinf(bench.solving_time) or (bench.verif < 8):
-                unsolved += 1
-            else:
-                score += min(1, 1 - math.log(bench.solving_time)/math.log(args.timeout))
-        print(f"{args.benchmark} {alg} {score} {unsolved}")
+    # all benchmarks are run by this process: it starts only once
+    for benchmark in args.benchmark:
+        csv_file = (args.csv or "bench-{benchmark}.csv").replace("{benchmark}", benchmark)
+        if args.from_csv:
+            problems, results = load_results(csv_file)
+            scores = {}
+            for res in results.values():
+                for stats in res:
+                    add_score(scores, stats, args.timeout)
+        else:
+            problems, results, scores = process_domain(BENCHMARKS[benchmark],
+                                                       bench_root,
+                                                       args.nb_problems, 
+                                                       shlex.split(args.planner_options),
+                                                       0,
+                                                       args.timeout,
+                                                       args.panda_prefix,
+                                                       args.jobs,
+                                                       args.cache_dir if args.cache else None,
+                                                       args.keep_plans,
+                                                       args.problem_cache,
+                                                       csv_file,
+                                                       args.runner,
+                                                       args.repeat,
+                                                       bool(args.plot or args.savefig))
+        if args.plot or args.savefig:
+            plot_results(benchmark, problems, results,
+                         args.savefig and args.savefig.replace("{benchmark}", benchmark),
+                         args.plot)
+
+        for alg, (score, unsolved) in scores.items():
+            print(f"{benchmark} {alg} {score} {unsolved}")
@@ -2,52 +2,47 @@ import sys
 import os
 import argparse
 import logging
-import time
-import itertools
 import io
-import subprocess
-from tempfile import NamedTemporaryFile
+from functools import lru_cache
+from typing import Optional
 
 import pddl
 from .grounding.problem import Problem
 from .search.greedy import GreedySearch, OpenLinkHeuristic, PlanHeuristic, HaddVariant
-from .utils.profiling import start_profiling, stop_profiling
+from .utils.profiling import start_profiling, stop_profiling, phase
 from .utils.logger import setup_logging
 from .utils.io import output_ipc2020_hierarchical
 from .utils.cli import add_bool_arg, EnumAction
+from .cli import problem_parser
+from .utils import cache
 
 LOGGER = logging.getLogger(__name__)
 
-def main():
-    parser = argparse.ArgumentParser(description="pyHiPOP")
-    parser.add_argument("domain", help="PDDL domain file", type=str)
-    parser.add_argument("problem", help="PDDL problem file", type=str)
-    parser.add_argument("-d", "--debug", help="activate debug logs",
-                    action='store_const', dest="loglevel",
-                    const=logging.DEBUG, default=logging.WARNING)
-    parser.add_argument("-v", "--verbose", help="activate verbose logs",
-                    action='store_const', dest="loglevel",
-                    const=logging.INFO, default=logging.WARNING)
-    parser.add_argument("-o", "--output-graph",
-                    const='', default=None,
-                    action='store', nargs='?',
-                    help="generate output graphs")
-    parser.add_argument("--trace-malloc", help="activate tracemalloc",
-                    action='store_true')
-    parser.add_argument("--profile", help="activate profiling",
-                    action='store_true')
+# PDDL domains parsed by this process: persistent planners, like the
+# benchmark worker, parse a given domain only once
+DOMAINS = {}
+
+def memory_key(filename: str):
+    """Key of a file in memory caches, changing when the file is modified."""
+    stat = os.stat(filename)
+    return os.path.realpath(filename), stat.st_mtime_ns, stat.st_size
+
+@lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser; built once, as it is reused by inline benchmark runs."""
+    parser = problem_parser("pyHiPOP")
     parser.add_argument("--panda", help="path to the PANDA plan verifier",
                     type=str)
-    add_bool_arg(parser, 'filter-rigid', 'rigid',
-                 "use rigid relations to filter groundings", True)
-    add_bool_arg(parser, 'filter-relaxed', 'relaxed',
-                 "use delete-relaxation to filter groundings", True)
-    add_bool_arg(parser, 'htn', 'htn',
-                 "use pure HTN decomposition", True)
-    add_bool_arg(parser, 'mutex', 'mutex',
-                 "compute mutex on (motion) predicates", True)
     add_bool_arg(parser, 'inc-poset', 'incposet',
                  "use incremental poset impl.", False)
+    add_bool_arg(parser, 'cache', 'cache',
+                 "reuse the grounded problem of a previous run", False)
+    parser.add_argument("--cache-dir", help="directory of cached problems",
+                        default=os.path.join('.', '.hipop_cache'))
+    parser.add_argument("--cache-size", help="maximal size of cached problems, in MB",
+                        type=int, default=1024)
+    parser.add_argument("-j", "--jobs", help="number of processes parsing the PDDL files",
+                        type=int, default=1)
     parser.add_argument("--ol", help="heuristic to sort open links",
                         type=OpenLinkHeuristic, default=OpenLinkHeuristic.LIFO,
                         action=EnumAction)
@@ -57,57 +52,108 @@ def main():
     parser.add_argument("--hadd", help="Hadd variant",
                         type=HaddVariant, default=HaddVariant.HADD,
                         action=EnumAction)
+    return parser
 
-    args = parser.parse_args()
-    setup_logging(level=args.loglevel, without=['pddl'])
+def solve(args: argparse.Namespace) -> Optional[str]:
+    """Solve a problem; returns the plan in IPC2020 format, None if no plan is found."""
+    problem = None
+    if args.cache:
+        # grounded by another version of the planner, a problem may be wrong
+        problem_file = cache.cache_file(args.cache_dir, 'problem',
+                                        cache.contents_key(args.domain, args.problem),
+                                        args.rigid, args.relaxed, args.htn, args.mutex,
+                                        cache.planner_version())
+        problem = cache.load(problem_file)
 
-    tic = time.process_time()
-    LOGGER.info("Parsing PDDL domain %s", args.domain)
-    pddl_domain = pddl.parse_domain(args.domain, file_stream=True)
-    LOGGER.info("Parsing PDDL problem %s", args.problem)
-    pddl_problem = pddl.parse_problem(args.problem, file_stream=True)
-    toc = time.process_time()
-    LOGGER.warning("parsing duration: %.3f", (toc - tic))
+    if problem is None:
+        with phase(LOGGER, "parsing"):
+            pddl_problem = None
+            domain_key = memory_key(args.domain)
+            pddl_domain = DOMAINS.get(domain_key)
+            if pddl_domain is None and args.cache:
+                # domains are shared by many problems: cached on their own
+                domain_file = cache.cache_file(args.cache_dir, 'domain',
+                                               cache.contents_key(args.domain),
+                                               cache.planner_version())
+                pddl_domain = cache.load(domain_file)
+            if pddl_domain is None:
+                LOGGER.info("Parsing PDDL domain %s", args.domain)
+                if args.jobs > 1:
+                    # domain and problem are independent: parse them concurrently
+                    from concurrent.futures import ProcessPoolExecutor
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        future = executor.submit(pddl.parse_domain, args.domain,
+                                                 file_stream=True)
+                        LOGGER.info("Parsing PDDL problem %s", args.problem)
+                        pddl_problem = pddl.parse_problem(args.problem, file_stream=True)
+                        pddl_domain = future.result()
+                else:
+                    pddl_domain = pddl.parse_domain(args.domain, file_stream=True)
+                if args.cache:
+                    cache.dump(pddl_domain, domain_file)
+            if domain_key not in DOMAINS:
+                if len(DOMAINS) >= 8:
+                    DOMAINS.pop(next(iter(DOMAINS)))
+                DOMAINS[domain_key] = pddl_domain
+            if pddl_problem is None:
+                LOGGER.info("Parsing PDDL problem %s", args.problem)
+                pddl_problem = pddl.parse_problem(args.problem, file_stream=True)
 
-    profiler = start_profiling(args.trace_malloc, args.profile)
+        profiler = start_profiling(args.trace_malloc, args.profile)
+
+        LOGGER.info("Building HiPOP problem")
+        with phase(LOGGER, "grounding"):
+            problem = Problem(pddl_problem, pddl_domain, args.output_graph,
+                              args.rigid, args.relaxed, args.htn, mutex=args.mutex)
 
-    tic = time.process_time()
-    LOGGER.info("Building HiPOP problem")
-    problem = Problem(pddl_problem, pddl_domain, args.output_graph,
-                      args.rigid, args.relaxed, args.htn, mutex=args.mutex)
-    toc = time.process_time()
-    LOGGER.warning("grounding duration: %.3f", (toc - tic))
+        stop_profiling(args.trace_malloc, profiler, "profile-grounding.stat")
+        if args.cache:
+            cache.dump(problem, problem_file)
+            cache.prune(args.cache_dir, args.cache_size * 2**20)
 
-    stop_profiling(args.trace_malloc, profiler, "profile-grounding.stat")
     profiler = start_profiling(args.trace_malloc, args.profile)
 
     LOGGER.info("Solving problem")
-    tic = time.process_time()
-    solver = GreedySearch(problem,
-                          ol_heuristic=args.ol,
-                          plan_heuristic=args.plan,
-                          hadd_variant=args.hadd,
-                          inc_poset=args.incposet)
-    plan = solver.solve(output_current_plan=args.output_graph)
-    toc = time.process_time()
-    LOGGER.warning("solving duration: %.3f", (toc - tic))
+    with phase(LOGGER, "solving"):
+        solver = GreedySearch(problem,
+                              ol_heuristic=args.ol,
+                              plan_heuristic=args.plan,
+                              hadd_variant=args.hadd,
+                              inc_poset=args.incposet)
+        plan = solver.solve(output_current_plan=args.output_graph)
     stop_profiling(args.trace_malloc, profiler, "profile-solving.stat")
 
     if plan is None:
-        LOGGER.error("No plan found!")
-        sys.exit(1)
+        return None
 
     out_plan = io.StringIO()
     output_ipc2020_hierarchical(plan, problem, out_plan)
     plan = out_plan.getvalue()
-    print(plan)
     out_plan.close()
+    return plan
+
+def main():
+    args = build_parser().parse_args()
+    setup_logging(level=args.loglevel, without=['pddl'])
+
+    plan = solve(args)
+    if plan is None:
+        LOGGER.error("No plan found!")
+        sys.exit(1)
+    # encoded once, both for the output and the verifier
+    plan = plan.encode(encoding='utf-8')
+    sys.stdout.flush()
+    sys.stdout.buffer.write(plan)
+    sys.stdout.buffer.write(b'\n')
+    sys.stdout.buffer.flush()
 
     if args.panda:
+        import subprocess
+        from tempfile import NamedTemporaryFile
         with NamedTemporaryFile(dir='.', suffix=".plan", delete=False) as tmpfile:
             plan_file = tmpfile.name
             LOGGER.info("writing plan to file %s", plan_file)
-            tmpfile.write(plan.encode(encoding='utf-8'))
+            tmpfile.write(plan)
 
         cmd = [args.panda,
                "-verify",
@@ -116,8 +162,11 @@ def main():
                plan_file]
         LOGGER.info("verification command: %s", cmd)
         verificator = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-        verification = verificator.stdout.read().decode(encoding='utf-8')
-        print(verification)
+        # forwarded as it comes, without decoding it
+        for line in verificator.stdout:
+            sys.stdout.buffer.write(line)
+        verificator.wait()
+        sys.stdout.buffer.flush()
 
 if __name__ == '__main__':
     main()
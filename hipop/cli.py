@@ -0,0 +1,67 @@
+"""Command-line scaffolding shared by the pyHiPOP entry points."""
+import argparse
+import logging
+
+from .utils.cli import add_bool_arg
+
+LOGGER = logging.getLogger(__name__)
+
+
+def problem_parser(description: str) -> argparse.ArgumentParser:
+    """Build a parser of the options common to all entry points."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("domain", help="PDDL domain file", type=str)
+    parser.add_argument("problem", help="PDDL problem file", type=str)
+    parser.add_argument("-d", "--debug", help="activate debug logs",
+                        action='store_const', dest="loglevel",
+                        const=logging.DEBUG, default=logging.WARNING)
+    parser.add_argument("-v", "--verbose", help="activate verbose logs",
+                        action='store_const', dest="loglevel",
+                        const=logging.INFO, default=logging.WARNING)
+    parser.add_argument("-o", "--output-graph",
+                        const='', default=None,
+                        action='store', nargs='?',
+                        help="generate output graphs")
+    parser.add_argument("--trace-malloc", help="activate tracemalloc",
+                        action='store_true')
+    parser.add_argument("--profile", help="activate profiling",
+                        action='store_true')
+    add_bool_arg(parser, 'filter-rigid', 'rigid',
+                 "use rigid relations to filter groundings", True)
+    add_bool_arg(parser, 'filter-relaxed', 'relaxed',
+                 "use delete-relaxation to filter groundings", True)
+    add_bool_arg(parser, 'htn', 'htn',
+                 "use pure HTN decomposition", True)
+    add_bool_arg(parser, 'mutex', 'mutex',
+                 "compute mutex on (motion) predicates", True)
+    return parser
+
+
+def ground_problem(args: argparse.Namespace, **options):
+    """Parse the PDDL files and ground the problem.
+
+    :param args: arguments parsed by a :func:`problem_parser` parser
+    :param options: other options of the grounded problem
+    """
+    # deferred: entry points importing only this module, like hipop.grounding,
+    # do not load the parser and the grounding code to print their help
+    import pddl
+    from .grounding.problem import Problem
+    from .utils.profiling import start_profiling, stop_profiling, phase
+
+    with phase(LOGGER, "parsing"):
+        LOGGER.info("Parsing PDDL domain %s", args.domain)
+        pddl_domain = pddl.parse_domain(args.domain, file_stream=True)
+        LOGGER.info("Parsing PDDL problem %s", args.problem)
+        pddl_problem = pddl.parse_problem(args.problem, file_stream=True)
+
+    profiler = start_profiling(args.trace_malloc, args.profile)
+
+    LOGGER.info("Building HiPOP problem")
+    with phase(LOGGER, "grounding"):
+        problem = Problem(pddl_problem, pddl_domain, args.output_graph,
+                          args.rigid, args.relaxed, args.htn,
+                          mutex=args.mutex, **options)
+
+    stop_profiling(args.trace_malloc, profiler, "profile-grounding.stat")
+    return problem
@@ -16,16 +16,16 @@ class Atoms:
 
     @classmethod
     def atom(cls, predicate: str, *arguments: str) -> Tuple[int, str]:
-        args = tuple(arguments)
-        if args not in cls.__atoms[predicate]:
-            cls.__atoms[predicate][args] = (
-                cls.__counter, predicate)
-            cls.__predicates[cls.__counter] = (predicate, args)
+        atoms = cls.__atoms[predicate]
+        atom = atoms.get(arguments)
+        if atom is None:
+            atom = atoms[arguments] = (cls.__counter, predicate)
+            cls.__predicates[cls.__counter] = (predicate, arguments)
             LOGGER.debug("atom %s: %s %s", 
                          cls.__counter,
-                         predicate, args)
+                         predicate, arguments)
             cls.__counter += 1
-        return cls.__atoms[predicate][args]
+        return atom
 
     @classmethod
     def atoms_of(cls, predicate: str) -> Iterator[Tuple[int, str]]:
@@ -34,3 +34,18 @@ class Atoms:
     @classmethod
     def atom_to_predicate(cls, atom: int) -> Tuple[str, List[str]]:
         return cls.__predicates[atom]
+
+    @classmethod
+    def state(cls) -> Tuple[Dict, Dict, int]:
+        """Get the atoms registry, e.g. to pickle it with a problem."""
+        return cls.__atoms, cls.__predicates, cls.__counter
+
+    @classmethod
+    def restore(cls, state: Tuple[Dict, Dict, int]):
+        """Replace the atoms registry by a previously saved one."""
+        cls.__atoms, cls.__predicates, cls.__counter = state
+
+    @classmethod
+    def clear(cls):
+        """Empty the atoms registry, e.g. before grounding another problem."""
+        cls.restore((defaultdict(dict), defaultdict(dict), 0))
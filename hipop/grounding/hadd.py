@@ -1,8 +1,8 @@
 from typing import Union, Set, Iterator
 import math
+import heapq
 import logging
 import networkx
-import networkx.drawing.nx_pydot as pydot
 from collections import defaultdict
 
 from .atoms import Atoms
@@ -19,6 +19,7 @@ class HAdd:
         LOGGER.info("h_add computed for %d elements", len(self.__hadd))
 
     def write_dot(self, filename: str = "hadd-graph.dot"):
+        import networkx.drawing.nx_pydot as pydot
         graph = networkx.DiGraph()
         lit_to_pred = Atoms.atom_to_predicate
         self.__hadd['__init'] = 0
@@ -33,14 +34,20 @@ class HAdd:
         pydot.write_dot(graph, filename)
 
     def __compute(self, actions: Iterator[GroundedAction], init: Set[int], fluents: Set[int]):
-        """H_add computation from V. Vidal, 'YAHSP2: Keep It Simple, Stupid', IPC2011."""
+        """H_add computation from V. Vidal, 'YAHSP2: Keep It Simple, Stupid', IPC2011.
+
+        Literals are settled by increasing h_add, as in Dijkstra's algorithm:
+        an action is evaluated once, when its last precondition is settled.
+        """
 
-        literals = list(fluents)
-        update = dict()
         lit_in_pre = defaultdict(list)
-        pres = defaultdict(list)
-        adds = defaultdict(list)
+        pres = dict()
+        adds = dict()
         costs = dict()
+        # number of unsettled preconditions, and h_add of the settled ones
+        remaining = dict()
+        pre_cost = dict()
+        ready = []
 
         for action in actions:
             aname = str(action)
@@ -51,38 +58,44 @@ class HAdd:
             adds[aname] = list(action.effect[0])
             pres[aname] = list(pos)
             costs[aname] = action.cost
-            update[aname] = (len(pres[aname]) == 0)
-            if update[aname]:
-                self.__parents[aname] = aname
+            remaining[aname] = len(pres[aname])
+            pre_cost[aname] = 0
+            if not pres[aname]:
+                ready.append(aname)
 
-        for atom in literals:
+        queue = []
+        for atom in fluents:
             if atom in init:
                 self.__hadd[atom] = 0
-                for action in lit_in_pre[atom]:
-                    update[action] = True
                 self.__parents[atom] = '__init'
+                queue.append((0, atom))
             else:
                 self.__hadd[atom] = math.inf
+        heapq.heapify(queue)
+
+        def apply(aname: str):
+            c = pre_cost[aname]
+            self.__hadd[aname] = c
+            self.__parents[aname] = pres[aname] if pres[aname] else aname
+            g = c + costs[aname]
+            for p in adds[aname]:
+                if g < self.__hadd.get(p, math.inf):
+                    self.__hadd[p] = g
+                    self.__parents[p] = aname
+                    heapq.heappush(queue, (g, p))
 
-        loop = True
-        while loop:
-            loop = False
-            for action in actions:
-                aname = str(action)
-                if update[aname]:
-                    update[aname] = False
-                    c = sum(self.__hadd[p] for p in pres[aname])
-                    if c < self.__hadd[aname]:
-                        self.__hadd[aname] = c
-                        for p in adds[aname]:
-                            g = c + costs[aname]
-                            if g < self.__hadd[p]:
-                                self.__hadd[p] = g
-                                for action in lit_in_pre[p]:
-                                    loop = True
-                                    update[action] = True
-                                self.__parents[p] = aname
-                        self.__parents[aname] = pres[aname] if pres[aname] else aname
+        for aname in ready:
+            apply(aname)
+        while queue:
+            h, lit = heapq.heappop(queue)
+            if h > self.__hadd[lit]:
+                # already settled with a lower cost
+                continue
+            for aname in lit_in_pre[lit]:
+                remaining[aname] -= 1
+                pre_cost[aname] += h
+                if remaining[aname] == 0:
+                    apply(aname)
 
     def __call__(self, element: Union[int, str]) -> int:
         return self.__hadd[element]
@@ -1,4 +1,4 @@
-from typing import Tuple, Iterator, List, Dict, Any, Callable, Set
+from typing import Tuple, Iterator, List, Dict, Any, Callable, Set, Optional
 from collections import defaultdict
 import logging
 
@@ -15,6 +15,8 @@ class Literals:
     def __init__(self, domain: pddl.Domain, problem: pddl.Problem, 
                  objects: Objects, filter_rigid: bool = True,
                  equality: bool = False):
+        # Atom expressions are immutable: shared by all the operators using them
+        self.__atom_expressions = dict()
         # Build all Atoms
         atoms_per_predicate = defaultdict(set)
         for predicate in sorted(domain.predicates):
@@ -44,15 +46,17 @@ class Literals:
         LOGGER.info("Rigid relations: %d", len(self.__rigid))
         LOGGER.debug("Rigid relations: %s", self.__rigid)
         # Rigid Literals
-        rigid_atoms = set(a for a in Atoms.atoms()
-                          if Atoms.atom_to_predicate(a)[0] in self.__rigid)
+        # only look at the atoms of rigid relations, not at all atoms
+        rigid_atoms = set(a for pred in self.__rigid
+                          for (a, _) in Atoms.atoms_of(pred))
         LOGGER.info("Rigid atoms: %d", len(rigid_atoms))
         LOGGER.debug("Rigid atoms: %s", rigid_atoms)
-        pb_init = set(Atoms.atom(lit.name, *lit.arguments)[0] for lit in problem.init)
+        atom = Atoms.atom
+        pb_init = set(atom(lit.name, *lit.arguments)[0] for lit in problem.init)
         LOGGER.debug("Problem init state: %s", pb_init)
         if equality:
-            equals = set(Atoms.atom('=', o, o)[0] for o in objects)
-            diffs = set(Atoms.atom('=', o, u)[0]
+            equals = set(atom('=', o, o)[0] for o in objects)
+            diffs = set(atom('=', o, u)[0]
                         for o in objects for u in objects if u != o)
         else:
             equals = set()
@@ -106,16 +110,24 @@ class Literals:
     def __build_expression(self, formula: GOAL,
                          assignment: Dict[str, str],
                          objects: Objects,
-                         atom_factory: Callable[[List[str]], Any]) -> Expression:
+                         atom_factory: Callable[[List[str]], Any],
+                         expressions: Optional[Dict[int, Atom]] = None) -> Expression:
         if isinstance(formula, pddl.AtomicFormula):
             atom = atom_factory(formula.name, 
                                 *self.__assign(formula.arguments,
                                              assignment, False))
-            return Atom(atom)
+            if expressions is None:
+                return Atom(atom)
+            expression = expressions.get(atom)
+            if expression is None:
+                expression = expressions[atom] = Atom(atom)
+            return expression
         if isinstance(formula, pddl.NotFormula):
-            return Not(self.__build_expression(formula.formula, assignment, objects, atom_factory))
+            return Not(self.__build_expression(formula.formula, assignment, objects,
+                                               atom_factory, expressions))
         if isinstance(formula, pddl.AndFormula):
-            return And(*[self.__build_expression(f, assignment, objects, atom_factory)
+            return And(*[self.__build_expression(f, assignment, objects,
+                                                 atom_factory, expressions)
                         for f in formula.formulas])
         if isinstance(formula, pddl.WhenEffect):
             LOGGER.error("conditional effects not supported!")
@@ -123,7 +135,7 @@ class Literals:
         if isinstance(formula, pddl.ForallFormula):
             return And(*[self.__build_expression(formula.goal,
                                                  dict(assign, **assignment),
-                                                 objects, atom_factory)
+                                                 objects, atom_factory, expressions)
                          for assign in iter_objects(formula.variables, objects.per_type, dict())])
         return TrueExpr()
 
@@ -133,7 +145,9 @@ class Literals:
         def atom_factory(x, *args):
             a, _ = Atoms.atom(x, *args)
             return a
-        return self.__build_expression(formula, assignment, objects, atom_factory)
+        # only atoms of grounded operators are shared: they are all kept anyway
+        return self.__build_expression(formula, assignment, objects, atom_factory,
+                                       self.__atom_expressions)
 
     def build_partial(self, formula: GOAL,
                       assignment: Dict[str, str],
@@ -1,7 +1,6 @@
-from typing import Dict, List, Set, Iterator, Tuple, Callable, Iterable
+from typing import Dict, List, Set, Iterator, Tuple, Callable, Iterable, Sequence
 import logging
 import networkx
-import networkx.drawing.nx_pydot as pydot
 import itertools
 from collections import defaultdict
 
@@ -11,7 +10,7 @@ LOGGER = logging.getLogger(__name__)
 
 
 def iter_objects(variables: Iterable[pddl.Type],
-                 objects: Callable[[str], List[str]],
+                 objects: Callable[[str], Sequence[str]],
                  assignment: Dict[str, str]) -> Iterable[List[Tuple[str, List[str]]]]:
     var_assign = []
     for var in variables:
@@ -59,8 +58,11 @@ class Objects:
             LOGGER.debug('- %s: %s', typ, objs)
 
         self.__objects = list(objects)
+        # typing checks test membership: keep hashed sets along sorted lists
+        self.__objects_sets = {typ: frozenset(objs)
+                               for typ, objs in self.__objects_per_type.items()}
         for typ, objs in self.__objects_per_type.items():
-            self.__objects_per_type[typ] = list(sorted(objs))
+            self.__objects_per_type[typ] = tuple(sorted(objs))
 
     def __iter__(self):
         return self.__objects.__iter__()
@@ -70,14 +72,30 @@ class Objects:
         """Get all types."""
         return self.__objects_per_type.keys()
 
-    def per_type(self, objtype: str = 'object') -> Iterator[str]:
-        """Get all objects of a given type.
+    def per_type(self, objtype: str = 'object') -> Sequence[str]:
+        """Get all objects of a given type, sorted by name.
 
         :param objtype: the given type
         """
-        return self.__objects_per_type[objtype].__iter__()
+        return self.__objects_per_type.get(objtype, ())
+
+    def count_per_type(self, objtype: str = 'object') -> int:
+        """Get the number of objects of a given type.
+
+        :param objtype: the given type
+        """
+        return len(self.__objects_sets.get(objtype, ()))
+
+    def is_of_type(self, obj: str, objtype: str = 'object') -> bool:
+        """Test if an object is of a given type.
+
+        :param obj: the object
+        :param objtype: the given type
+        """
+        return obj in self.__objects_sets.get(objtype, ())
 
     def write_dot(self, filename: str, with_objects: bool = False):
+        import networkx.drawing.nx_pydot as pydot
         if with_objects:
             pydot.write_dot(self.__objects_graph, filename)
         else:
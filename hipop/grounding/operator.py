@@ -1,4 +1,4 @@
-from typing import Union, Set, Tuple, Dict, Iterator, Iterable, Optional
+from typing import Union, Set, FrozenSet, Tuple, Dict, Iterator, Iterable, Optional
 from abc import ABC
 import logging
 from collections import defaultdict
@@ -30,7 +30,7 @@ def ground_term(fun: str,
                 atype = a.type
             if name in assignment:
                 name = assignment[name]
-                if name not in objects.per_type(atype):
+                if not objects.is_of_type(name, atype):
                     raise TypingAssignmentInconsistent(fun, name)
             params.append(name)
         return f"({fun} {' '.join(params)})"
@@ -60,6 +60,9 @@ class WithPrecondition(ABC):
             if isinstance(pre, FalseExpr):
                 raise PreconditionUnsatisfiable(repr(self), self._pre)
             self._pre = pre
+        # the support is read for each applicability test: computed once
+        pos, neg = self._pre.support
+        self.__support = frozenset(pos), frozenset(neg)
 
     @property
     def precondition(self) -> Expression:
@@ -75,19 +78,15 @@ class WithPrecondition(ABC):
         return isinstance(self._pre, FalseExpr)
 
     @property
-    def support(self) -> Tuple[Set[int], Set[int]]:
-        """Get precondition expression."""
-        return self._pre.support
+    def support(self) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        """Get precondition positive and negative atoms."""
+        return self.__support
 
     def is_applicable(self, state: Set[int]) -> bool:
         """Test if operator is applicable in state."""
-        #LOGGER.debug("is applicable %s in %s and not %s", state, self.__pos, self.__neg)
-        if self.is_tautology:
-            return True
-        if self.is_contradiction:
-            return False
-        pos, neg = self._pre.support
-        return (pos <= state) and not (neg & state)
+        # tautologies have an empty support; contradictions are rejected at construction
+        pos, neg = self.__support
+        return pos <= state and neg.isdisjoint(state)
 
 
 class WithEffect(ABC):
@@ -188,7 +187,7 @@ class GroundedAction(WithPrecondition, WithEffect, GroundedOperator):
                             objects=objects, literals=literals,
                             **kwargs)
         self.__cost = 1
-        LOGGER.debug("action %s pre %s eff %s", str(self), self.precondition, self.effect)
+        LOGGER.debug("action %s pre %s eff %s", self, self.precondition, self.effect)
 
     @property
     def cost(self) -> int:
@@ -241,7 +240,9 @@ class GroundedMethod(WithPrecondition, GroundedOperator):
         for m in maxs:
             self.__network.add_relation(m, '__goal', check_poset=False)
         #self.__network.write_dot(f"{self}-tn.dot")
-        LOGGER.debug("method %s pre %s", str(self), self.precondition)
+        # sorted on first use: the network is not modified afterwards
+        self.__sorted_tasks = None
+        LOGGER.debug("method %s pre %s", self, self.precondition)
 
     @property
     def task(self) -> str:
@@ -259,9 +260,12 @@ class GroundedMethod(WithPrecondition, GroundedOperator):
         return self.__subtasks[taskid]
 
     @property
-    def sorted_tasks(self) -> Iterator[str]:
-        return (self.subtask(t) for t in self.task_network.topological_sort()
-                if t not in ['__init', '__goal'])
+    def sorted_tasks(self) -> Tuple[str, ...]:
+        if self.__sorted_tasks is None:
+            self.__sorted_tasks = tuple(self.subtask(t)
+                                        for t in self.task_network.topological_sort()
+                                        if t not in ['__init', '__goal'])
+        return self.__sorted_tasks
 
 
 class GroundedTask(GroundedOperator):
@@ -1,12 +1,10 @@
 """Planning Problem."""
 from typing import Set, Iterator, Tuple, Dict, Optional, Union, Any, Type, List
 from collections import defaultdict
-from functools import reduce
 import itertools
 import math
 import logging
 import networkx
-import networkx.drawing.nx_pydot as pydot
 import time
 
 import pddl
@@ -19,6 +17,7 @@ from .hadd import HAdd
 from .tdg import TaskDecompositionGraph
 from .atoms import Atoms
 from .logic import FalseExpr
+from ..utils.cache import planner_version
 
 LOGGER = logging.getLogger(__name__)
 
@@ -80,15 +79,13 @@ class Problem:
 
         # Actions grounding
         LOGGER.info("PDDL actions: %d", len(domain.actions))
-        LOGGER.info("Possible action groundings: %d",
-                    self.__nb_grounded_operators(domain.actions))
-        ground = self.__ground_operator
+        # statistics only computed when logged
+        log_stats = LOGGER.isEnabledFor(logging.INFO)
+        if log_stats:
+            LOGGER.info("Possible action groundings: %d",
+                        self.__nb_grounded_operators(domain.actions))
         tic = time.process_time()
-        self.__grounded_actions = dict()
-        for action in domain.actions:
-            groundings = list(ground(action, GroundedAction, dict()))
-            LOGGER.debug("operator %s has %d groundings", action.name, len(groundings))
-            self.__grounded_actions.update({str(a): a for a in groundings})
+        self.__grounded_actions = self.__ground_operators(domain.actions, GroundedAction)
         toc = time.process_time()
         LOGGER.info("action grounding duration: %.3fs", (toc - tic))
         LOGGER.info("Grounded actions: %d", len(self.__grounded_actions))
@@ -103,61 +100,55 @@ class Problem:
         LOGGER.info("hadd duration: %.3fs", (toc - tic))
         if output is not None:
             self.__hadd.write_dot(f"{output}hadd-graph.dot")
-        LOGGER.info("Reachable actions: %d", sum(
-            1 for a in self.__grounded_actions if not math.isinf(self.__hadd(a))))
+        if log_stats:
+            LOGGER.info("Reachable actions: %d", sum(
+                1 for a in self.__grounded_actions if not math.isinf(self.__hadd(a))))
 
         # Methods grounding
         LOGGER.info("PDDL methods: %d", len(methods))
-        LOGGER.info("Possible method groundings: %d",
-                    self.__nb_grounded_operators(methods))
-        ground = self.__ground_operator
+        if log_stats:
+            LOGGER.info("Possible method groundings: %d",
+                        self.__nb_grounded_operators(methods))
         tic = time.process_time()
-        self.__grounded_methods = dict()
-        for op in methods:
-            groundings = list(ground(op, GroundedMethod, dict()))
-            LOGGER.debug("operator %s has %d groundings",
-                         op.name, len(groundings))
-            self.__grounded_methods.update({str(a): a for a in groundings})
+        self.__grounded_methods = self.__ground_operators(methods, GroundedMethod)
         toc = time.process_time()
         LOGGER.info("method grounding duration: %.3fs", (toc - tic))
         LOGGER.info("Grounded methods: %d", len(self.__grounded_methods))
 
         # Tasks grounding
         LOGGER.info("PDDL tasks: %d", len(tasks))
-        LOGGER.info("Possible task groundings: %d",
-                    self.__nb_grounded_operators(tasks))
-        ground = self.__ground_operator
+        if log_stats:
+            LOGGER.info("Possible task groundings: %d",
+                        self.__nb_grounded_operators(tasks))
         tic = time.process_time()
-        self.__grounded_tasks = dict()
-        for op in tasks:
-            groundings = list(ground(op, GroundedTask, dict()))
-            LOGGER.debug("operator %s has %d groundings",
-                         op.name, len(groundings))
-            self.__grounded_tasks.update({str(a): a for a in groundings})
+        self.__grounded_tasks = self.__ground_operators(tasks, GroundedTask)
         toc = time.process_time()
         LOGGER.info("task grounding duration: %.3fs", (toc - tic))
         LOGGER.info("Grounded tasks: %d", len(self.__grounded_tasks))
 
         # Lifted TDG
         # TODO: move to tdg.py
-        tic = time.process_time()
-        lifted_tdg = networkx.DiGraph()
-        for m in methods:
-            lifted_tdg.add_edge(m.task.name, m.name)
-            for (_, t) in m.network.subtasks:
-                lifted_tdg.add_edge(m.name, t.name)
-        toc = time.process_time()
-        LOGGER.info("lifted TDG duration: %.3fs", (toc - tic))
-        if output is not None:
-            pydot.write_dot(lifted_tdg, f"{output}tdg-lifted.dot")
+        # only depends on the domain methods: built only when it is used
+        if output is not None or tdg_cycles:
+            tic = time.process_time()
+            lifted_tdg = networkx.DiGraph()
+            for m in methods:
+                lifted_tdg.add_edge(m.task.name, m.name)
+                for (_, t) in m.network.subtasks:
+                    lifted_tdg.add_edge(m.name, t.name)
+            toc = time.process_time()
+            LOGGER.info("lifted TDG duration: %.3fs", (toc - tic))
+            if output is not None:
+                import networkx.drawing.nx_pydot as pydot
+                pydot.write_dot(lifted_tdg, f"{output}tdg-lifted.dot")
 
-        if tdg_cycles:
-            try:
-                cycle = networkx.find_cycle(lifted_tdg)
-                LOGGER.info("Domain is recursive")
-                LOGGER.debug("Found cycle in lifted TDG: %s", cycle)
-            except networkx.NetworkXNoCycle:
-                pass
+            if tdg_cycles:
+                try:
+                    cycle = networkx.find_cycle(lifted_tdg)
+                    LOGGER.info("Domain is recursive")
+                    LOGGER.debug("Found cycle in lifted TDG: %s", cycle)
+                except networkx.NetworkXNoCycle:
+                    pass
         # TODO: we can first filter on the lifted TDG! even including action not reachable in delete-relaxation
 
         # TDG
@@ -192,7 +183,11 @@ class Problem:
             if output is not None:
                 self.__tdg.write_dot(f"{output}tdg-htn.dot")
         if tdg_cycles:
-            LOGGER.info("TDG cycles: %d", len(list(self.__tdg.cycles)))
+            # enumerating all the simple cycles is exponential
+            components = self.__tdg.recursive_components
+            LOGGER.info("TDG recursive components: %d", len(components))
+            for scc in components:
+                LOGGER.debug("TDG recursive component of %d nodes: %s", len(scc), scc)
         tic = time.process_time()
         self.__tdg.compute_heuristics()
         toc = time.process_time()
@@ -218,6 +213,21 @@ class Problem:
             LOGGER.info("Mutex computation duration: %.3fs", (toc - tic))
             LOGGER.debug("Mutex: %s", self.__mutex)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # atoms are numbered in a global registry: it must travel with the problem
+        state = self.__dict__.copy()
+        state['atoms'] = Atoms.state()
+        state['version'] = planner_version()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # a problem grounded by another version of the planner is not reused
+        version = state.pop('version', None)
+        if version != planner_version():
+            raise ValueError(f"problem pickled by planner version {version}")
+        Atoms.restore(state.pop('atoms'))
+        self.__dict__.update(state)
+
     @property
     def name(self) -> str:
         return self.__problem
@@ -310,7 +320,7 @@ class Problem:
                 if isinstance(expr, FalseExpr):
                     #LOGGER.debug("droping operator %s for impossible rigid grounding", op.name)
                     continue
-                for assignment in iter_objects(op.parameters, self.__objects.per_type, rigid_assign):
+                for assignment in iter_objects(op.parameters, self.__objects.per_type, dict(rigid_assign)):
                     try:
                         yield gop(op, dict(assignment), literals=self.__literals, objects=self.__objects)
                     except GroundingImpossibleError as ex:
@@ -324,11 +334,24 @@ class Problem:
                     LOGGER.debug(
                         "droping operator %s : %s [%s]", op.name, ex.message, ex.__class__.__name__)
 
+    def __ground_operators(self, operators: Iterator[Any],
+                           gop: type) -> Dict[str, Type[GroundedOperator]]:
+        """Ground operators, indexed by name."""
+        grounded = dict()
+        ground = self.__ground_operator
+        for op in operators:
+            nb_grounded = len(grounded)
+            # groundings are indexed as they are built, without intermediate containers
+            grounded.update((str(a), a) for a in ground(op, gop, dict()))
+            LOGGER.debug("operator %s has %d groundings",
+                         op.name, len(grounded) - nb_grounded)
+        return grounded
+
     def __nb_grounded_operators(self, operators):
-        per_type = self.__objects.per_type
+        count_per_type = self.__objects.count_per_type
         nb_groundings = 0
         for op in operators:
-            n = reduce(int.__mul__, [len(list(per_type(p.type))) for p in op.parameters], 1)
+            n = math.prod(count_per_type(p.type) for p in op.parameters)
             LOGGER.debug("operator %s has %d groundings", op.name, n)
             nb_groundings += n
         return nb_groundings
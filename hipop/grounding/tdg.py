@@ -9,7 +9,16 @@ from .hadd import HAdd
 
 LOGGER = logging.getLogger(__name__)
 
-TDGHeuristic = namedtuple('h_TDG', ['cost', 'modifications', 'hadd_max'])
+TDGHeuristic = namedtuple('TDGHeuristic', ['cost', 'modifications', 'hadd_max'])
+
+
+def _no_effects() -> Tuple[Set[int], Set[int]]:
+    return set(), set()
+
+
+def _no_heuristics() -> TDGHeuristic:
+    return TDGHeuristic(0, 0, math.inf)
+
 
 class TaskDecompositionGraph:
 
@@ -41,9 +50,9 @@ class TaskDecompositionGraph:
         # TODO: prune cycles (see Behnke et al., 2020)
 
         # Optimistic task effects (see Angelic Planning) and Heuristics
-        self.__task_effects = defaultdict(lambda: (set(), set()))
+        self.__task_effects = defaultdict(_no_effects)
         self.__hadd = hadd
-        self.__heuristics = defaultdict(lambda: TDGHeuristic(0, 0, math.inf))
+        self.__heuristics = defaultdict(_no_heuristics)
         for name, action in actions.items():
             self.__task_effects[name] = action.effect
             self.__heuristics[name] = TDGHeuristic(cost=action.cost, modifications=1, 
@@ -69,6 +78,12 @@ class TaskDecompositionGraph:
     def cycles(self) -> Iterator[List[str]]:
         return networkx.simple_cycles(self.__graph)
 
+    @property
+    def recursive_components(self) -> List[Set[str]]:
+        """Strongly connected components containing at least one cycle."""
+        return [scc for scc in networkx.strongly_connected_components(self.__graph)
+                if len(scc) > 1 or any(self.__graph.has_edge(n, n) for n in scc)]
+
     def has_cycles(self) -> bool:
         try:
             cycle = networkx.find_cycle(self.__graph)
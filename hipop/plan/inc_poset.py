@@ -3,7 +3,6 @@ from copy import deepcopy
 import logging
 import networkx
 from networkx.algorithms import isomorphism
-import networkx.drawing.nx_pydot as nx_pydot
 
 LOGGER = logging.getLogger(__name__)
 
@@ -3,7 +3,6 @@ from copy import deepcopy
 import logging
 import networkx
 from networkx.algorithms import isomorphism
-import networkx.drawing.nx_pydot as nx_pydot
 
 T = TypeVar('T')
 LOGGER = logging.getLogger(__name__)
@@ -147,4 +146,5 @@ class Poset(Generic[T]):
         return networkx.topological_sort(self._graph)
 
     def write_dot(self, filename: str):
+        import networkx.drawing.nx_pydot as nx_pydot
         nx_pydot.write_dot(self._graph, filename)
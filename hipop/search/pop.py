@@ -78,8 +78,8 @@ class POP():
     def get_partialPlan_from_queues(self, heur_1_openList, heur_2_openList, h1_score, h2_score, prev_h1,
                                     prev_h2) -> HierarchicalPartialPlan:
 
-        LOGGER.debug("Queues status:\n  min f(n) for h1: {} -- h1 score: {}\n  min f(n) for h2: {} -- h2 "
-                     "score: {}".format(prev_h1, h1_score, prev_h2, h2_score))
+        LOGGER.debug("Queues status:\n  min f(n) for h1: %s -- h1 score: %s\n  min f(n) for h2: %s -- h2 "
+                     "score: %s", prev_h1, h1_score, prev_h2, h2_score)
 
         if self.OL_BOOST and not self.empty_local_OL_openlist:
             n = self.OPEN_local_OL[0]
@@ -179,14 +179,14 @@ class POP():
                     "current plan %d has no resolver: closing plan", id(current_pplan))
                 continue
 
-            LOGGER.info("Current plan has {} flaws ({}/{} : {}/{} : {}/{})".format(
+            LOGGER.info("Current plan has %d flaws (%d/%d : %d/%d : %d/%d)",
                 len(current_pplan.pending_abstract_flaws) + len(current_pplan.pending_open_links) + len(
                     current_pplan.pending_threats),
                 len(current_pplan.pending_abstract_flaws), len(
                     current_pplan.abstract_flaws),
                 len(current_pplan.pending_open_links), len(
                     current_pplan.open_links),
-                len(current_pplan.pending_threats), len(current_pplan.threats)))
+                len(current_pplan.pending_threats), len(current_pplan.threats))
 
             successors = list()
             while current_pplan.has_pending_flaws:
@@ -354,14 +354,14 @@ class POP():
                 min_local_heur_1 = math.inf
                 not_improving = True
 
-            LOGGER.debug("Count {}".format(count))
+            LOGGER.debug("Count %s", count)
 
-            LOGGER.info("Current plan has {} flaws ({} : {} : {})".format(
+            LOGGER.info("Current plan has %d flaws (%d : %d : %d)",
                 len(current_pplan.pending_abstract_flaws) + len(current_pplan.pending_open_links) + len(
                     current_pplan.pending_threats),
                 len(current_pplan.pending_abstract_flaws),
                 len(current_pplan.pending_open_links),
-                len(current_pplan.pending_threats)))
+                len(current_pplan.pending_threats))
 
             current_flaw = current_pplan.get_best_flaw()
             LOGGER.debug("resolver candidate: %s", current_flaw)
@@ -469,12 +469,12 @@ class POP():
                     self.OPEN_local_OL.remove(current_pplan)
                 continue
 
-            LOGGER.info("Current plan has {} flaws ({} : {} : {})".format(
+            LOGGER.info("Current plan has %d flaws (%d : %d : %d)",
                 len(current_pplan.pending_abstract_flaws) + len(current_pplan.pending_open_links) + len(
                     current_pplan.pending_threats),
                 len(current_pplan.pending_abstract_flaws),
                 len(current_pplan.pending_open_links),
-                len(current_pplan.pending_threats)))
+                len(current_pplan.pending_threats))
 
             current_flaw = current_pplan.get_best_flaw()
             LOGGER.debug("resolver candidate: %s", current_flaw)
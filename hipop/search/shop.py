@@ -63,7 +63,7 @@ class SHOP():
             s1 = frozenset(action.apply(state))
             if self.__nds and s1 in seen:
                 if action in seen[s1]:
-                    LOGGER.debug("couple state-action already visited {}-{}".format(s1, action))
+                    LOGGER.debug("couple state-action already visited %s-%s", s1, action)
                     return None
 
             seen[s1].append(action)
@@ -76,7 +76,7 @@ class SHOP():
             return result
 
         else:
-            LOGGER.debug("action {} is NOT applicable".format(action))
+            LOGGER.debug("action %s is NOT applicable", action)
             return None
 
 
@@ -0,0 +1,99 @@
+import os
+import pickle
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+def cache_file(cache_dir: str, *key: Any) -> str:
+    """Get the cache file of an object identified by key."""
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+
+def files_key(*filenames: str) -> tuple:
+    """Key identifying the current version of some files."""
+    return tuple((os.path.abspath(f), os.path.getmtime(f), os.path.getsize(f))
+                 for f in filenames)
+
+
+def contents_key(*filenames: str) -> str:
+    """Key identifying the contents of some files, wherever they are."""
+    digest = hashlib.blake2b(digest_size=16)
+    for f in filenames:
+        with open(f, 'rb') as stream:
+            digest.update(stream.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def planner_version() -> str:
+    """Digest of the planner sources: objects cached by other versions are not reused."""
+    package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = sorted(os.path.join(root, f)
+                     for root, _, files in os.walk(package)
+                     for f in files if f.endswith('.py'))
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sources:
+        with open(source, 'rb') as stream:
+            digest.update(stream.read())
+    return digest.hexdigest()
+
+
+def load(filename: str) -> Optional[Any]:
+    """Load a cached object; returns None if not cached."""
+    try:
+        with open(filename, 'rb') as f:
+            obj = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as ex:
+        LOGGER.warning("ignoring unreadable cache file %s: %s", filename, ex)
+        return None
+    # recently used objects are the last ones to be pruned
+    try:
+        os.utime(filename)
+    except OSError:
+        # pruned by another process in the meantime
+        pass
+    LOGGER.info("loaded cached object from %s", filename)
+    return obj
+
+
+def dump(obj: Any, filename: str):
+    """Cache an object; the file is replaced atomically."""
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    tmp_file = f"{filename}.{os.getpid()}"
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, filename)
+    except Exception as ex:
+        LOGGER.warning("cannot cache object in %s: %s", filename, ex)
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return
+    LOGGER.info("cached object in %s", filename)
+
+
+def prune(cache_dir: str, max_size: int):
+    """Remove the least recently used objects until the cache fits in max_size bytes."""
+    try:
+        with os.scandir(cache_dir) as entries:
+            files = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                     for e in entries if e.name.endswith('.pkl')]
+    except FileNotFoundError:
+        return
+    size = 0
+    for _, file_size, filename in sorted(files, reverse=True):
+        size += file_size
+        if size > max_size:
+            LOGGER.info("pruning cached object %s", filename)
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
@@ -29,11 +29,18 @@ def output_ipc2020_hierarchical(plan: HierarchicalPartialPlan,
             if step.operator in ['__top', '(__top )']:
                 root_task = index
     LOGGER.debug("index mapping: %s", index_map)
+    # Position of non-method steps, to output substeps in the plan order
+    # without scanning the whole plan for each decomposition
+    position = {x: i for (i, (x, s)) in enumerate(seq_plan)
+                if not problem.has_method(s.operator)}
+
+    def sorted_substeps(decomposition):
+        substeps = sorted((x for x in set(decomposition.substeps) if x in position),
+                          key=position.__getitem__)
+        return [index_map[x] for x in substeps]
+
     # Root Task
-    decomposition = plan.get_decomposition(root_task)
-    root_subtasks = [index_map[x] for (x, s) in seq_plan 
-                     if not problem.has_method(s.operator)
-                     if x in decomposition.substeps]
+    root_subtasks = sorted_substeps(plan.get_decomposition(root_task))
     out_stream.write(f"root {' '.join(map(str, root_subtasks))}\n")
     # Hierarchy
     for (index, step) in seq_plan:
@@ -42,9 +49,7 @@ def output_ipc2020_hierarchical(plan: HierarchicalPartialPlan,
                 continue
             decomposition = plan.get_decomposition(index)
             method = problem.method(decomposition.method)
-            subtasks = [index_map[x] for (x, s) in seq_plan 
-                        if x in decomposition.substeps
-                        if not problem.has_method(s.operator)]
+            subtasks = sorted_substeps(decomposition)
             out_stream.write(f"{index_map[index]} {step.operator} -> {method.name} ")
             out_stream.write(" ".join(map(str, subtasks)))
             out_stream.write("\n")
@@ -7,10 +7,15 @@ except ImportError:
     pass
 
 def setup_logging(level=logging.DEBUG, without=[]):
+    # thread and process names are not logged: do not look them up for each record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     root = logging.getLogger()
     root.setLevel(level)
-    format      = '%(asctime)s - %(levelname)-8s - %(name)s - %(message)s'
-    date_format = '%Y-%m-%d %H:%M:%S'
+    # time since start-up, in ms: no date formatting for each record
+    format      = '%(relativeCreated)9.0f - %(levelname)-8s - %(name)s - %(message)s'
+    date_format = None
     if 'colorlog' in sys.modules and os.isatty(2):
         cformat = '%(log_color)s' + format
         f = colorlog.ColoredFormatter(cformat, date_format,
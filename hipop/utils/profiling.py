@@ -1,9 +1,21 @@
 import tracemalloc
 import linecache
 import cProfile
+import logging
+import time
+from contextlib import contextmanager
 
 from typing import Any
 
+
+@contextmanager
+def phase(logger: logging.Logger, name: str):
+    """Log the wall-clock duration of a phase, as a warning."""
+    tic = time.perf_counter_ns()
+    yield
+    logger.warning("%s duration: %.3f", name, (time.perf_counter_ns() - tic) * 1e-9)
+
+
 def start_profiling(malloc: bool = False, prof: bool = False) -> Any:
     if malloc:
         tracemalloc.start()
@@ -0,0 +1,45 @@
+"""Persistent planner.
+
+Solves problems read on the standard input, one JSON-encoded list of
+pyHiPOP command-line arguments per line, and answers each of them with a
+JSON object on one line: ``{"plan": ...}``, the plan being null if no plan
+is found. This saves the interpreter startup and imports for every run.
+"""
+import sys
+import json
+import logging
+import contextlib
+
+from .__main__ import build_parser, solve
+from .grounding.atoms import Atoms
+from .utils.logger import setup_logging
+
+LOGGER = logging.getLogger(__name__)
+
+
+def main():
+    parser = build_parser()
+    setup_logging(level=logging.WARNING, without=['pddl'])
+    for line in sys.stdin:
+        # atoms of the previous problem must not leak into the next one
+        Atoms.clear()
+        plan = None
+        try:
+            args = parser.parse_args(json.loads(line))
+            logging.getLogger().setLevel(args.loglevel)
+            logging.getLogger('pddl').setLevel(args.loglevel + 10)
+            # stdout is reserved to answers
+            with contextlib.redirect_stdout(sys.stderr):
+                plan = solve(args)
+        except SystemExit:
+            LOGGER.error("Invalid request: %s", line.strip())
+        except Exception as ex:
+            LOGGER.error("Solving failed: %s [%s]", ex, ex.__class__.__name__)
+        else:
+            if plan is None:
+                LOGGER.error("No plan found!")
+        sys.stdout.write(json.dumps({'plan': plan}) + '\n')
+        sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import os
+import unittest
+import tempfile
+from unittest import mock
+
+from hipop.utils import cache
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_dump_load(self):
+        filename = cache.cache_file(self.cache_dir, 'test', 1)
+        self.assertIsNone(cache.load(filename))
+        cache.dump({'a': [1, 2]}, filename)
+        self.assertEqual(cache.load(filename), {'a': [1, 2]})
+        # no temporary file is left behind
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(filename)])
+
+    def test_cache_file(self):
+        self.assertEqual(cache.cache_file(self.cache_dir, 'test', 1),
+                         cache.cache_file(self.cache_dir, 'test', 1))
+        self.assertNotEqual(cache.cache_file(self.cache_dir, 'test', 1),
+                            cache.cache_file(self.cache_dir, 'test', 2))
+
+    def test_load_pruned(self):
+        filename = cache.cache_file(self.cache_dir, 'test')
+        cache.dump(42, filename)
+        # another process prunes the file once it has been read
+        with mock.patch('os.utime', side_effect=FileNotFoundError(filename)):
+            self.assertEqual(cache.load(filename), 42)
+
+    def test_corrupt_file(self):
+        filename = cache.cache_file(self.cache_dir, 'test')
+        with open(filename, 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(cache.load(filename))
+
+    def test_prune(self):
+        files = []
+        for i in range(4):
+            filename = cache.cache_file(self.cache_dir, 'test', i)
+            cache.dump(bytes(1000), filename)
+            # the first files are the least recently used
+            os.utime(filename, (1000 + i, 1000 + i))
+            files.append(filename)
+        size = os.path.getsize(files[0])
+        cache.prune(self.cache_dir, 2 * size)
+        self.assertEqual([os.path.exists(f) for f in files],
+                         [False, False, True, True])
+        # loading an object makes it the most recently used one
+        cache.load(files[2])
+        cache.prune(self.cache_dir, size)
+        self.assertEqual([os.path.exists(f) for f in files],
+                         [False, False, True, False])
+
+    def test_prune_missing_directory(self):
+        cache.prune(os.path.join(self.cache_dir, 'missing'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import math
+import unittest
+from types import SimpleNamespace
+
+import pddl
+
+from hipop.grounding.atoms import Atoms
+from hipop.grounding.hadd import HAdd
+from hipop.grounding.problem import Problem
+
+PROBLEMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'problems')
+
+
+class Action:
+
+    def __init__(self, name, pos=(), neg=(), adds=(), dels=(), cost=1):
+        self.__name = name
+        self.support = frozenset(pos), frozenset(neg)
+        self.effect = set(adds), set(dels)
+        self.cost = cost
+
+    def __str__(self):
+        return self.__name
+
+
+def fixed_point_hadd(actions, init, fluents):
+    """Reference h_add: relax the actions until nothing changes."""
+    hadd = {lit: 0 if lit in init else math.inf for lit in fluents}
+    update = True
+    while update:
+        update = False
+        for a in actions:
+            cost = sum(hadd.get(lit, math.inf) for lit in a.support[0])
+            if cost != hadd.get(str(a)):
+                hadd[str(a)] = cost
+                update = True
+            for lit in a.effect[0]:
+                if cost + a.cost < hadd.get(lit, math.inf):
+                    hadd[lit] = cost + a.cost
+                    update = True
+    return hadd
+
+
+class TestHAdd(unittest.TestCase):
+
+    def test_hadd(self):
+        actions = [Action('a', pos=[0], neg=[1], adds=[1], dels=[0]),
+                   Action('b', pos=[0], adds=[2]),
+                   # shares its preconditions with a and d
+                   Action('c', pos=[1, 2], adds=[3]),
+                   Action('d', pos=[1], adds=[3]),
+                   # literal 4 is never reached
+                   Action('e', pos=[4], adds=[0, 5]),
+                   Action('f', adds=[4], cost=3)]
+        hadd = HAdd(actions, {0}, {0, 1, 2, 3, 4, 5, 6})
+        # negative preconditions and deletes are relaxed
+        self.assertEqual(hadd('a'), 0)
+        self.assertEqual(hadd(1), 1)
+        self.assertEqual(hadd('b'), 0)
+        self.assertEqual(hadd(2), 1)
+        self.assertEqual(hadd('c'), 2)
+        self.assertEqual(hadd('d'), 1)
+        # the cheapest achiever of a literal is kept
+        self.assertEqual(hadd(3), 2)
+        self.assertEqual(hadd('f'), 0)
+        self.assertEqual(hadd(4), 3)
+        self.assertEqual(hadd('e'), 3)
+        self.assertEqual(hadd(5), 4)
+        self.assertEqual(hadd(0), 0)
+        self.assertTrue(math.isinf(hadd(6)))
+
+    def test_unreachable(self):
+        actions = [Action('a', pos=[0, 1], adds=[2]),
+                   Action('b', pos=[2], adds=[3])]
+        hadd = HAdd(actions, {0}, {0, 1, 2, 3})
+        for element in ('a', 'b', 1, 2, 3):
+            self.assertTrue(math.isinf(hadd(element)))
+
+    def test_rover(self):
+        Atoms.clear()
+        domain = pddl.parse_domain(os.path.join(PROBLEMS, 'rover-domain.hddl'),
+                                   file_stream=True)
+        problem = pddl.parse_problem(os.path.join(PROBLEMS, 'pfile1.hddl'),
+                                     file_stream=True)
+        # no action is pruned from the TDG
+        problem = Problem(problem, domain, filter_relaxed=False, pure_htn=False)
+        actions = [problem.action(node) for node in problem.tdg
+                   if problem.has_action(node)]
+        self.assertTrue(any(a.support[1] for a in actions))
+        init = problem.init[0]
+        fluents = problem.literals.varying_literals
+        expected = fixed_point_hadd(actions, init, fluents)
+        for element, value in expected.items():
+            self.assertEqual(problem.hadd(element), value, element)
+        self.assertTrue(any(math.isinf(expected[lit]) for lit in fluents))
+        self.assertTrue(any(math.isinf(expected[str(a)]) for a in actions))
+
+
+if __name__ == '__main__':
+    unittest.main()
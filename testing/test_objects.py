@@ -0,0 +1,56 @@
+import unittest
+
+import pddl
+
+from hipop.grounding.objects import Objects
+
+
+class TestObjects(unittest.TestCase):
+
+    domain = """(define (domain test-objects)
+        (:types
+            type-A type-B - supertype-A
+            type-C - type-A
+            )
+        (:constants
+            obj-A - type-A
+            )
+        )
+        """
+    problem = """(define (problem test-objects-pb)
+        (:domain test-objects)
+        (:objects a1 - type-A b1 b2 - type-B c1 - type-C )
+        (:init)
+        )
+        """
+
+    def test_is_of_type(self):
+        objects = Objects(problem=pddl.parse_problem(self.problem),
+                          domain=pddl.parse_domain(self.domain))
+        self.assertTrue(objects.is_of_type('c1', 'type-C'))
+        self.assertTrue(objects.is_of_type('c1', 'type-A'))
+        self.assertTrue(objects.is_of_type('c1', 'supertype-A'))
+        self.assertTrue(objects.is_of_type('obj-A', 'type-A'))
+        self.assertTrue(objects.is_of_type('b1'))
+        self.assertFalse(objects.is_of_type('b1', 'type-A'))
+        self.assertFalse(objects.is_of_type('a1', 'type-C'))
+        self.assertFalse(objects.is_of_type('a1', 'type-E'))
+        for typ in objects.types:
+            for obj in objects.per_type(typ):
+                self.assertTrue(objects.is_of_type(obj, typ))
+
+    def test_count_per_type(self):
+        objects = Objects(problem=pddl.parse_problem(self.problem),
+                          domain=pddl.parse_domain(self.domain))
+        self.assertEqual(objects.count_per_type('type-C'), 1)
+        self.assertEqual(objects.count_per_type('type-A'), 3)
+        self.assertEqual(objects.count_per_type('supertype-A'), 5)
+        self.assertEqual(objects.count_per_type(), 5)
+        self.assertEqual(objects.count_per_type('type-E'), 0)
+        for typ in objects.types:
+            self.assertEqual(objects.count_per_type(typ),
+                             len(list(objects.per_type(typ))))
+
+
+if __name__ == '__main__':
+    unittest.main()
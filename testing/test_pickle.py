@@ -0,0 +1,75 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import pddl
+
+from hipop.grounding.atoms import Atoms
+from hipop.grounding.problem import Problem
+from hipop.utils import cache
+
+PROBLEMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'problems')
+
+
+class TestPickle(unittest.TestCase):
+
+    def setUp(self):
+        Atoms.clear()
+        domain = pddl.parse_domain(os.path.join(PROBLEMS, 'transport-domain-htn.hddl'),
+                                   file_stream=True)
+        problem = pddl.parse_problem(os.path.join(PROBLEMS, 'transport-pfile01.hddl'),
+                                     file_stream=True)
+        self.problem = Problem(problem, domain)
+
+    def tearDown(self):
+        Atoms.clear()
+
+    @staticmethod
+    def atoms():
+        return {atom: Atoms.atom_to_predicate(atom) for atom in Atoms.atoms()}
+
+    @staticmethod
+    def tdg(problem):
+        return {node: set(problem.tdg.successors(node)) for node in problem.tdg}
+
+    def test_round_trip(self):
+        atoms = self.atoms()
+        tdg = self.tdg(self.problem)
+        data = pickle.dumps(self.problem)
+        # the problem is loaded in a fresh planner
+        Atoms.clear()
+        self.assertEqual(len(Atoms.atoms()), 0)
+        problem = pickle.loads(data)
+        self.assertEqual(self.atoms(), atoms)
+        self.assertEqual(problem.init, self.problem.init)
+        self.assertEqual(self.tdg(problem), tdg)
+        actions = [node for node in tdg if self.problem.has_action(node)]
+        self.assertTrue(actions)
+        for name in actions:
+            self.assertEqual(problem.action(name).support,
+                             self.problem.action(name).support)
+            self.assertEqual(problem.action(name).effect,
+                             self.problem.action(name).effect)
+            self.assertEqual(problem.hadd(name), self.problem.hadd(name))
+        # atoms of the next problem follow the restored ones
+        atom, _ = Atoms.atom('test-pickle')
+        self.assertNotIn(atom, atoms)
+
+    def test_other_version(self):
+        state = self.problem.__getstate__()
+        state['version'] = 'other'
+        with self.assertRaises(ValueError):
+            Problem.__new__(Problem).__setstate__(state)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            filename = cache.cache_file(cache_dir, 'problem')
+            with mock.patch('hipop.grounding.problem.planner_version',
+                            return_value='other'):
+                cache.dump(self.problem, filename)
+            # a problem cached by another version is a cache miss
+            self.assertIsNone(cache.load(filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
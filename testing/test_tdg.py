@@ -0,0 +1,40 @@
+import unittest
+from types import SimpleNamespace
+
+from hipop.grounding.tdg import TaskDecompositionGraph
+
+
+class TestTDG(unittest.TestCase):
+
+    @staticmethod
+    def tdg(methods, tasks, actions):
+        actions = {a: SimpleNamespace(effect=(set(), set()), cost=1)
+                   for a in actions}
+        methods = {m: SimpleNamespace(task=t, subtasks=subtasks)
+                   for m, (t, subtasks) in methods.items()}
+        tasks = {t: None for t in tasks}
+        return TaskDecompositionGraph(actions, methods, tasks, lambda node: 0)
+
+    def test_not_recursive(self):
+        tdg = self.tdg({'m1': ('t1', ['a1', 't2']), 'm2': ('t2', ['a2'])},
+                       ['t1', 't2'], ['a1', 'a2'])
+        self.assertEqual(tdg.recursive_components, [])
+        self.assertFalse(tdg.has_cycles())
+
+    def test_recursive(self):
+        # get_to is decomposed into get_to and an action, or into an action
+        tdg = self.tdg({'via': ('get_to', ['get_to', 'drive']),
+                        'direct': ('get_to', ['drive']),
+                        'top': ('__top', ['get_to'])},
+                       ['get_to', '__top'], ['drive'])
+        self.assertEqual(tdg.recursive_components, [{'get_to', 'via'}])
+        self.assertTrue(tdg.has_cycles())
+
+    def test_self_loop(self):
+        # a node which is its own successor is recursive on its own
+        tdg = self.tdg({'loop': ('loop', ['a1'])}, ['loop', 't1'], ['a1'])
+        self.assertEqual(tdg.recursive_components, [{'loop'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DOMAIN = os.path.join(ROOT, 'problems', 'transport-domain-htn.hddl')
+PROBLEM = os.path.join(ROOT, 'problems', 'transport-pfile01.hddl')
+
+
+class TestWorker(unittest.TestCase):
+
+    def setUp(self):
+        # the same hash seed, hence the same search, in all the planners
+        path = [ROOT, os.environ.get('PYTHONPATH')]
+        self.env = dict(os.environ, PYTHONHASHSEED='0',
+                        PYTHONPATH=os.pathsep.join(p for p in path if p))
+
+    def planner(self, *arguments, **kwargs):
+        return subprocess.run([sys.executable, '-m', *arguments], cwd=ROOT, env=self.env,
+                              stdout=subprocess.PIPE, encoding='utf-8',
+                              check=True, **kwargs)
+
+    def test_worker(self):
+        plan = self.planner('hipop', DOMAIN, PROBLEM).stdout
+        requests = [[DOMAIN, PROBLEM],
+                    ['--no-such-option', DOMAIN, PROBLEM],
+                    [DOMAIN, os.path.join(ROOT, 'problems', 'missing.hddl')],
+                    [DOMAIN, PROBLEM]]
+        answers = self.planner('hipop.worker',
+                               input=''.join(json.dumps(r) + '\n' for r in requests)).stdout
+        answers = [json.loads(line) for line in answers.splitlines()]
+        # one answer per request, in order, even for failed requests
+        self.assertEqual(len(answers), len(requests))
+        self.assertEqual(answers[0]['plan'] + '\n', plan)
+        self.assertIsNone(answers[1]['plan'])
+        self.assertIsNone(answers[2]['plan'])
+        # atoms of the previous problems do not change the next plan
+        self.assertEqual(answers[3]['plan'] + '\n', plan)
+
+
+if __name__ == '__main__':
+    unittest.main()